@@ -0,0 +1,5 @@
+"""A few hole-filling scripts that were useful in preparing our RNAseq workshop
+
+each module runs as a script (`python -m rnaseq_helpers.<module>`), and all of them as subcommands
+of `rnaseq-helpers` (see rnaseq_helpers.cli)
+"""
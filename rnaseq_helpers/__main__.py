@@ -0,0 +1,5 @@
+"""`python -m rnaseq_helpers <subcommand> [options]`, same as `rnaseq-helpers`"""
+
+from rnaseq_helpers.cli import main
+
+main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Find and print all AGIs (via RegEx) in a text file"""
+
+from __future__ import print_function
+
+import re
+import sys
+import getopt
+
+from rnaseq_helpers import helper_io
+from rnaseq_helpers import helper_profile
+
+
+def get_all_agis(file_in, re_agi, background=False):
+    """Find all AGIs in a text and ignore all context"""
+    matches_agi = []
+    # AGIs never span lines, so the text can be streamed line by line
+    with helper_io.open_in(file_in, background=background) as handle:
+        for line in handle:
+            matches_agi.extend(refomat_agi(x) for x in re_agi.findall(line))
+    return matches_agi
+
+
+def get_agis_by_line(file_in, re_agi, delimiter='\t', sub_delimiter=';', background=False):
+    """Find all AGIs per line and report these before each line"""
+    with helper_io.open_in(file_in, background=background) as handle:
+        for line in handle:
+            line = line.rstrip()
+            matches_agi = re_agi.findall(line)
+            matches_agi = [refomat_agi(x) for x in matches_agi]
+            matches_str = sub_delimiter.join(matches_agi)
+            yield matches_str + delimiter + line
+
+
+def refomat_agi(agi):
+    out = agi.upper()
+    return out
+
+
+def usage():
+    usagestr = """rnaseq-helpers agi_finder -i text_file [options] > AGIs.txt
+###############
+-i | --in=              input text file ('-' for stdin, may be gzip/bzip2/xz/zstd compressed)
+-l | --line_wise        find AGI #s by line and return with line
+--read_thread           read and decompress input in a background thread
+--profile=              write cProfile/tracemalloc output to files starting with this prefix
+-h | --help             prints this message
+"""
+    print(usagestr, file=sys.stderr)
+    sys.exit(1)
+
+
+def main(argv=None):
+    file_in = None
+    by_line = False
+    background = False
+    profile = None
+    # get opt
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        opts, args = getopt.gnu_getopt(argv, "i:lh",
+                                       ["in=", "line_wise", "read_thread", "profile=", "help"])
+    except getopt.GetoptError as err:
+        print (str(err), file=sys.stderr)
+        usage()
+
+    for o, a in opts:
+        if o in ("-i", "--in"):
+            file_in = a
+        elif o in ("-l", "--line_wise"):
+            by_line = True
+        elif o == "--read_thread":
+            background = True
+        elif o == "--profile":
+            profile = a
+        elif o in ("-h", "--help"):
+            usage()
+        else:
+            assert False, "unhandled option"
+
+    if file_in is None:
+        print("input file required")
+        usage()
+
+    # RegEx by which AGI's are actually identified
+    re_agi = re.compile('[Aa][Tt][CcMm1-5][Gg][0-9]{5}')
+
+    with helper_profile.profiled(profile):
+        if by_line:
+            to_print = get_agis_by_line(file_in, re_agi, background=background)
+        else:
+            to_print = get_all_agis(file_in, re_agi, background=background)
+
+        for unit in to_print:
+            print(unit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""benchmark the hot paths of the helper scripts on deterministic synthetic data"""
+
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+from rnaseq_helpers import helper_profile
+
+SCALES = {'small': 10000, 'medium': 100000, 'large': 1000000}
+
+
+# synthetic data generators, all deterministic for a given seed and number of records
+def random_agi(rng):
+    return 'AT{}G{:05d}'.format(rng.choice('12345CM'), rng.randint(0, 99999))
+
+
+def write_prose(path, n, rng):
+    """n lines of text, each with 0-3 AGIs in a mix of cases"""
+    words = ['expression', 'of', 'the', 'gene', 'was', 'higher', 'in', 'roots', 'than', 'leaves', 'see', 'table']
+    with open(path, 'w') as f:
+        for _ in range(n):
+            line = [rng.choice(words) for _ in range(rng.randint(5, 15))]
+            for _ in range(rng.randint(0, 3)):
+                agi = random_agi(rng)
+                line.insert(rng.randint(0, len(line)), agi if rng.random() < 0.8 else agi.lower())
+            f.write(' '.join(line) + '\n')
+
+
+def write_hit_table(path, n, rng, hits_per_query=5, shuffled=True):
+    """n blast outfmt 6 lines, sorted by query (and score) unless shuffled"""
+    n_targets = max(n // 50, 1)
+    lines = []
+    for i in range(n):
+        query = 'query{:08d}'.format(i // hits_per_query)
+        target = 'target{:06d}'.format(rng.randrange(n_targets))
+        score = rng.uniform(20, 500)
+        lines.append((query, -score, '{}\t{}\t98.5\t250\t3\t0\t1\t250\t1001\t1250\t1e-50\t{:.1f}\n'.format(
+            query, target, score)))
+    if shuffled:
+        rng.shuffle(lines)
+    else:
+        lines.sort()
+    with open(path, 'w') as f:
+        f.writelines(line for _, _, line in lines)
+
+
+def write_isoseq_gff3(path, n, rng):
+    """n Iso-Seq style transcripts (transcript and exon features) in gff3"""
+    with open(path, 'w') as f:
+        f.write('##gff-version 3\n')
+        pos = 1
+        for i in range(n):
+            strand = rng.choice('+-')
+            exons = []
+            start = pos
+            for _ in range(rng.randint(1, 10)):
+                end = start + rng.randint(50, 500)
+                exons.append((start, end))
+                start = end + rng.randint(60, 2000)
+            t_id = 'PB.{}.1'.format(i + 1)
+            f.write('Chr1\tPacBio\ttranscript\t{}\t{}\t.\t{}\t.\tID={};gene_id=PB.{}\n'.format(
+                exons[0][0], exons[-1][1], strand, t_id, i + 1))
+            for start, end in exons:
+                f.write('Chr1\tPacBio\texon\t{}\t{}\t.\t{}\t.\tParent={}\n'.format(start, end, strand, t_id))
+            pos = exons[-1][1] + rng.randint(100, 5000)
+
+
+def random_seq(rng, length):
+    return ''.join(rng.choice('ACGT') for _ in range(length))
+
+
+def write_cogent_tree(fasta, out_dir, n, rng, per_partition=10, partitioned_fraction=0.5, missing_fraction=0.05):
+    """n input sequences in fasta, about half of them partitioned into Cogent style output directories"""
+    os.mkdir(out_dir)
+    with open(fasta, 'w') as f_all:
+        i = 0
+        while i < n:
+            if rng.random() < partitioned_fraction:
+                partition = os.path.join(out_dir, 'partition{:06d}'.format(i))
+                os.mkdir(partition)
+                members = min(per_partition, n - i)
+                with open(os.path.join(partition, 'in.fa'), 'w') as f_in:
+                    for j in range(members):
+                        seq = random_seq(rng, 60)
+                        f_in.write('>seq{}\n{}\n'.format(i + j, seq))
+                        f_all.write('>seq{}\n{}\n'.format(i + j, seq))
+                if rng.random() >= missing_fraction:
+                    with open(os.path.join(partition, 'cogent2.renamed.fasta'), 'w') as f_out:
+                        for j in range(max(members // 3, 1)):
+                            f_out.write('>partition{}|path{}\n{}\n'.format(i, j, random_seq(rng, 120)))
+                i += members
+            else:
+                f_all.write('>seq{}\n{}\n'.format(i, random_seq(rng, 60)))
+                i += 1
+
+
+def random_cigar(rng, read_length):
+    """mostly plain matches, with soft clips, introns, insertions and deletions mixed in"""
+    ops = []
+    remaining = read_length
+    if rng.random() < 0.1:
+        clip = rng.randint(1, 10)
+        ops.append('{}S'.format(clip))
+        remaining -= clip
+    while remaining > 0:
+        match = min(remaining, rng.randint(10, read_length))
+        ops.append('{}M'.format(match))
+        remaining -= match
+        if remaining > 5:
+            event = rng.random()
+            if event < 0.1:
+                ops.append('{}N'.format(rng.randint(60, 2000)))
+            elif event < 0.15:
+                ops.append('2I')
+                remaining -= 2
+            elif event < 0.2:
+                ops.append('3D')
+    return ''.join(ops)
+
+
+def write_sam_region(path, n, rng, read_length=100):
+    """n coordinate sorted sam records (pairs) on 'Chr1', returns the central window (start, stop)"""
+    length = max(n * read_length // 20, 10 * read_length)
+    records = []
+    for i in range(n // 2):
+        pos = rng.randint(1, length)
+        mate_pos = pos + rng.randint(0, 400)
+        cigar, mate_cigar = random_cigar(rng, read_length), random_cigar(rng, read_length)
+        tlen = mate_pos + read_length - pos
+        qual = 'I' * read_length
+        name = 'read{:09d}'.format(i)
+        records.append((pos, '{}\t99\tChr1\t{}\t60\t{}\t=\t{}\t{}\t{}\t{}\tMC:Z:{}\tNM:i:0\n'.format(
+            name, pos, cigar, mate_pos, tlen, random_seq(rng, read_length), qual, mate_cigar)))
+        records.append((mate_pos, '{}\t147\tChr1\t{}\t60\t{}\t=\t{}\t{}\t{}\t{}\tMC:Z:{}\tNM:i:0\n'.format(
+            name, mate_pos, mate_cigar, pos, -tlen, random_seq(rng, read_length), qual, cigar)))
+    records.sort(key=lambda x: x[0])
+    with open(path, 'w') as f:
+        f.writelines(line for _, line in records)
+    return length // 4, 3 * length // 4
+
+
+def write_gff_region(path, n, rng):
+    """n exon gff3 lines on two sequences, returns the central window (start, stop) on 'Chr1'"""
+    length = n * 200
+    with open(path, 'w') as f:
+        f.write('##gff-version 3\n')
+        for i in range(n):
+            start = rng.randint(1, length)
+            f.write('{}\tsrc\texon\t{}\t{}\t.\t+\t.\tID=e{}\n'.format(
+                rng.choice(('Chr1', 'Chr1', 'Chr2')), start, start + rng.randint(50, 3000), i))
+    return length // 4, 3 * length // 4
+
+
+def generate(data_dir, n, seed):
+    """write all synthetic inputs for n records to data_dir, returns dict of paths and parameters"""
+    rng = random.Random(seed)
+    data = {
+        'prose': os.path.join(data_dir, 'prose.txt'),
+        'hits': os.path.join(data_dir, 'hits.tsv'),
+        'hits_sorted': os.path.join(data_dir, 'hits_sorted.tsv'),
+        'isoseq_gff3': os.path.join(data_dir, 'isoseq.gff3'),
+        'cogent_fasta': os.path.join(data_dir, 'cogent_in.fa'),
+        'cogent_dir': os.path.join(data_dir, 'cogent'),
+        'cogent_out': os.path.join(data_dir, 'cogent_out.fa'),
+        'sam': os.path.join(data_dir, 'region.sam'),
+        'gff': os.path.join(data_dir, 'region.gff3'),
+    }
+    write_prose(data['prose'], n, rng)
+    write_hit_table(data['hits'], n, rng, shuffled=True)
+    write_hit_table(data['hits_sorted'], n, rng, shuffled=False)
+    write_isoseq_gff3(data['isoseq_gff3'], max(n // 6, 1), rng)
+    write_cogent_tree(data['cogent_fasta'], data['cogent_dir'], n, rng)
+    data['sam_window'] = write_sam_region(data['sam'], n, rng)
+    data['gff_window'] = write_gff_region(data['gff'], n, rng)
+    # records per input, counted here so that the engines' timings don't include re-reading input
+    data['records'] = {
+        'prose': count_lines(data['prose']),
+        'hits': count_lines(data['hits']),
+        'hits_sorted': count_lines(data['hits_sorted']),
+        'isoseq_gff3': count_lines(data['isoseq_gff3'], prefix='Chr1\tPacBio\ttranscript\t'),
+        'cogent_fasta': count_lines(data['cogent_fasta'], prefix='>'),
+        'sam': count_lines(data['sam']),
+        'gff': count_lines(data['gff']),
+    }
+    return data
+
+
+def count_lines(path, prefix=''):
+    """number of lines in path (starting with prefix)"""
+    with open(path) as f:
+        return sum(1 for line in f if line.startswith(prefix))
+
+
+# engines, each takes the data dict and returns the number of records processed (counted by generate)
+def count_blat_resort(data):
+    from rnaseq_helpers import count_blat
+    count_blat.BlastCounter().count(data['hits'], re_sort=True)
+    return data['records']['hits']
+
+
+def count_blat_presorted(data):
+    from rnaseq_helpers import count_blat
+    count_blat.BlastCounter().count(data['hits_sorted'], re_sort=False)
+    return data['records']['hits_sorted']
+
+
+def agi_all(data):
+    import re
+    from rnaseq_helpers import agi_finder
+    agi_finder.get_all_agis(data['prose'], re.compile('[Aa][Tt][CcMm1-5][Gg][0-9]{5}'))
+    return data['records']['prose']
+
+
+def agi_by_line(data):
+    import re
+    from rnaseq_helpers import agi_finder
+    for _ in agi_finder.get_agis_by_line(data['prose'], re.compile('[Aa][Tt][CcMm1-5][Gg][0-9]{5}')):
+        pass
+    return data['records']['prose']
+
+
+def hints_make_lines(data):
+    from rnaseq_helpers import gff3_to_hints_isoseq
+    for a_transcripts_worth in gff3_to_hints_isoseq.group_transcripts(data['isoseq_gff3']):
+        transcript = gff3_to_hints_isoseq.Transcript(a_transcripts_worth)
+        transcript.make_lines(gff3_to_hints_isoseq.Transcript.supported_targets, priority=4, source='E')
+    return data['records']['isoseq_gff3']
+
+
+def cogent_merge(data):
+    from rnaseq_helpers import clean_cogent_output
+    devnull = open(os.devnull, 'w')
+    # silence the missing output warnings, which are intentional
+    stdout, stderr, sys.stdout, sys.stderr = sys.stdout, sys.stderr, devnull, devnull
+    try:
+        clean_cogent_output.main(data['cogent_fasta'], data['cogent_dir'], data['cogent_out'])
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        devnull.close()
+    return data['records']['cogent_fasta']
+
+
+def subset_gff(data):
+    from rnaseq_helpers import subset_genome_related
+    start, stop = data['gff_window']
+    with open(data['gff']) as f:
+        for line in f:
+            try:
+                subset_genome_related.shift_gff_line(line, 'Chr1', start, stop)
+            except subset_genome_related.OutOfRangeError:
+                pass
+    return data['records']['gff']
+
+
+def subset_sam(data):
+    from rnaseq_helpers import subset_genome_related
+    start, stop = data['sam_window']
+    window = subset_genome_related.SamWindow('Chr1', start, stop)
+    with open(data['sam']) as f:
+        for _ in window.shift_lines(f):
+            pass
+    return data['records']['sam']
+
+
+def subset_sam_subsampled(data):
+    from rnaseq_helpers import subset_genome_related
+    start, stop = data['sam_window']
+    window = subset_genome_related.SamWindow('Chr1', start, stop)
+    subsampler = subset_genome_related.SamSubsampler(fraction=0.5, max_depth=50)
+    with open(data['sam']) as f:
+        for _ in subsampler.filter_lines(window.shift_lines(f)):
+            pass
+    return data['records']['sam']
+
+
+ENGINES = {
+    'count_blat.resort': count_blat_resort,
+    'count_blat.presorted': count_blat_presorted,
+    'agi_finder.all': agi_all,
+    'agi_finder.by_line': agi_by_line,
+    'gff3_to_hints_isoseq.make_lines': hints_make_lines,
+    'clean_cogent_output.merge': cogent_merge,
+    'subset_genome_related.gff': subset_gff,
+    'subset_genome_related.sam': subset_sam,
+    'subset_genome_related.sam_subsampled': subset_sam_subsampled,
+}
+
+
+def _run_engine(name, data, profile, conn):
+    """child process side, so that the peak RSS is that of one engine only"""
+    try:
+        start = time.perf_counter()
+        with helper_profile.profiled(profile):
+            records = ENGINES[name](data)
+        wall = time.perf_counter() - start
+        # ru_maxrss is in KiB on linux, but bytes on mac
+        scale = 1 if sys.platform == 'darwin' else 1024
+        conn.send(('ok', records, wall, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale))
+    except ImportError as e:  # optional dependencies of the engine
+        conn.send(('skipped', str(e), None, None))
+    except Exception as e:
+        conn.send(('failed', '{}: {}'.format(type(e).__name__, e), None, None))
+    conn.close()
+
+
+def run_engine(name, data, profile=None):
+    """run one engine in a fresh interpreter, returns (status, records or message, wall seconds, peak rss bytes)"""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_run_engine, args=(name, data, profile, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = ('failed', 'exit code {}'.format(process.exitcode), None, None)
+    process.join()
+    return result
+
+
+def format_row(scale, name, result):
+    status, records, wall, rss = result
+    if status != 'ok':
+        return '{}\t{}\t{}: {}'.format(scale, name, status, records)
+    return '{}\t{}\t{}\t{:.3f}\t{:.0f}\t{:.1f}'.format(scale, name, records, wall, records / wall if wall else 0,
+                                                       rss / 2 ** 20)
+
+
+def main(scales, engines, seed, data_dir, profile_dir):
+    print('scale\tengine\trecords\twall_s\trecords_per_s\tpeak_rss_MiB')
+    for scale, n in scales:
+        if data_dir is None:
+            scale_dir = tempfile.mkdtemp(prefix='rnaseq_helpers_bench_')
+        else:
+            scale_dir = os.path.join(data_dir, scale)
+            os.makedirs(scale_dir)
+        try:
+            data = generate(scale_dir, n, seed)
+            for name in engines:
+                profile = None
+                if profile_dir is not None:
+                    profile = os.path.join(profile_dir, '{}.{}'.format(scale, name))
+                print(format_row(scale, name, run_engine(name, data, profile)))
+                sys.stdout.flush()
+        finally:
+            if data_dir is None:
+                shutil.rmtree(scale_dir)
+
+
+def cli(argv=None):
+    """parse command line arguments and run"""
+    parser = argparse.ArgumentParser(description='benchmark helper script engines on synthetic data, reporting '
+                                                 'records/s, wall time and peak RSS (each engine runs in its own '
+                                                 'process) as tab separated table')
+    parser.add_argument('--scales', default='small,medium',
+                        help='comma separated scales from {} (default: small,medium)'.format(
+                            ', '.join('{} ({} records)'.format(k, v) for k, v in SCALES.items())))
+    parser.add_argument('-n', '--records', default=None, type=int,
+                        help='benchmark this exact number of records instead of --scales')
+    parser.add_argument('-e', '--engines', default=','.join(ENGINES),
+                        help='comma separated engines to run from {}'.format(', '.join(ENGINES)))
+    parser.add_argument('--seed', default=0, type=int, help='seed for generating the synthetic data')
+    parser.add_argument('--keep_data', default=None,
+                        help='write the synthetic data to this (new) directory and keep it, instead of a tmp dir')
+    parser.add_argument('--profile', default=None, help='write cProfile/tracemalloc output for each engine '
+                                                        'to this directory (slows engines down)')
+    args = parser.parse_args(argv)
+
+    if args.records is not None:
+        chosen_scales = [(str(args.records), args.records)]
+    else:
+        chosen_scales = [(x, SCALES[x]) for x in args.scales.split(',')]
+    chosen_engines = args.engines.split(',')
+    unknown = [x for x in chosen_engines if x not in ENGINES]
+    if unknown:
+        parser.error('unknown engine(s) {}'.format(unknown))
+    if args.profile is not None and not os.path.exists(args.profile):
+        os.makedirs(args.profile)
+    main(chosen_scales, chosen_engines, args.seed, args.keep_data, args.profile)
+
+
+if __name__ == "__main__":
+    cli()
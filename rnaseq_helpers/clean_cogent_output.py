@@ -8,21 +8,31 @@ from __future__ import print_function
 import os
 import sys
 import argparse
-from Bio import SeqIO
 
+from rnaseq_helpers import helper_io
+from rnaseq_helpers import helper_profile
 
-def main(fasta, cogent_output_dir, fileout):
+
+def parse_fasta(path, background=False):
+    """generate SeqRecords from a (possibly compressed, or '-' for stdin) fasta file"""
+    from Bio import SeqIO  # imported here, as biopython is slow to import
+    with helper_io.open_in(path, background=background) as handle:
+        for seq in SeqIO.parse(handle, 'fasta'):
+            yield seq
+
+
+def main(fasta, cogent_output_dir, fileout, background=False):
     # get a list of sequences that were partitioned
     partitioned_seq_ids = []
     partitions = os.listdir(cogent_output_dir)
     for partition in partitions:
         # open each fasta file and record the sequence IDs
-        for seq in SeqIO.parse('{}/{}/in.fa'.format(cogent_output_dir, partition), 'fasta'):
+        for seq in parse_fasta('{}/{}/in.fa'.format(cogent_output_dir, partition)):
             partitioned_seq_ids.append(seq.id)
 
     # get all the hq sequences
     not_partitioned = []
-    for seq in SeqIO.parse(fasta, 'fasta'):
+    for seq in parse_fasta(fasta, background=background):
         # subtract partitioned from all to get not-partitioned
         if seq.id not in partitioned_seq_ids:
             not_partitioned.append(seq)
@@ -33,7 +43,7 @@ def main(fasta, cogent_output_dir, fileout):
     for partition in partitions:
         expected_result = '{}/{}/cogent2.renamed.fasta'.format(cogent_output_dir, partition)
         try:
-            for seq in SeqIO.parse(expected_result, 'fasta'):
+            for seq in parse_fasta(expected_result):
                 partitioned.append(seq)
         except IOError:
             print("Warning: {} not found".format(expected_result), file=sys.stderr)
@@ -44,18 +54,29 @@ def main(fasta, cogent_output_dir, fileout):
     # output the original non partitioned sequences, and where they were before cogent, and the further collapsed
     # cogent output for the partitioned sequences
     out = not_partitioned + partitioned
-    with open(fileout, 'w') as f:
+    from Bio import SeqIO
+    with helper_io.open_out(fileout) as f:
         SeqIO.write(out, f, 'fasta')
 
 
-if __name__ == "__main__":
+def cli(argv=None):
+    """parse command line arguments and run"""
     parser = argparse.ArgumentParser(description='reorganize output of cogent to produce one fasta for the '
                                                  'whole transcriptome')
-    parser.add_argument('-f', '--fasta', required=True, type=str, help='fasta file that cogent received as input')
+    parser.add_argument('-f', '--fasta', required=True, type=str, help='fasta file that cogent received as input '
+                                                                      '(- for stdin, may be compressed)')
     parser.add_argument('-c', '--cogent_output_dir', required=True, type=str, help='output directory for cogent')
-    parser.add_argument('-o', '--out', required=True, type=str, help='output file name')
+    parser.add_argument('-o', '--out', required=True, type=str, help='output file name (- for stdout, compressed '
+                                                                     'if ending in .gz, .bz2, .xz or .zst)')
+    parser.add_argument('--read_thread', action='store_true', help='read and decompress --fasta in a background '
+                                                                   'thread')
+    parser.add_argument('--profile', default=None, help='write cProfile/tracemalloc output to files starting with '
+                                                        'this prefix')
 
-    args = parser.parse_args()
-    main(args.fasta, args.cogent_output_dir, args.out)
+    args = parser.parse_args(argv)
+    with helper_profile.profiled(args.profile):
+        main(args.fasta, args.cogent_output_dir, args.out, background=args.read_thread)
 
 
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""single entry point to all helper scripts, as `rnaseq-helpers <subcommand> [options]`
+
+Only the module for the requested subcommand is imported, so start up stays fast. For running many
+small jobs, `rnaseq-helpers batch` runs job specs (JSON lines) one after another in the same warm process.
+"""
+
+from __future__ import print_function
+
+import importlib
+import sys
+import time
+
+# subcommand -> (module, function taking an argv list)
+SUBCOMMANDS = {
+    'agi_finder': ('rnaseq_helpers.agi_finder', 'main'),
+    'clean_cogent_output': ('rnaseq_helpers.clean_cogent_output', 'cli'),
+    'count_blat': ('rnaseq_helpers.count_blat', 'main'),
+    'gff3_to_hints_isoseq': ('rnaseq_helpers.gff3_to_hints_isoseq', 'main'),
+    'subset_genome_related': ('rnaseq_helpers.subset_genome_related', 'cli'),
+    'benchmark': ('rnaseq_helpers.benchmark', 'cli'),
+}
+
+
+class JobSpecError(Exception):
+    pass
+
+
+class _StdinTaken(object):
+    """stands in for sys.stdin during batch jobs, while stdin carries the job specs themselves"""
+    def __getattr__(self, name):
+        raise JobSpecError("stdin is carrying the job specs, so jobs can't read it ('-'), "
+                           "pass the jobs as a file to `rnaseq-helpers batch jobs.jsonl` instead")
+
+
+def usage(msg=''):
+    usestr = """rnaseq-helpers <subcommand> [options]
+runs one of the helper scripts, see `rnaseq-helpers <subcommand> -h` for its options
+###########################################################
+subcommands:
+{}
+batch [jobs.jsonl]      run many jobs in one process, one JSON job spec per line
+                        (from the file, or stdin if not given or '-') e.g.
+                        {{"command": "count_blat", "args": ["-i", "hits.tsv"], "stdout": "counts.tsv", "id": "x"}}
+                        "stdout" (optional, may end in .gz etc...) captures the job's standard output, and a
+                        JSON status line per job is written to stderr. Jobs can only read stdin ('-')
+                        when the job specs come from a file
+""".format('\n'.join(sorted(SUBCOMMANDS)))
+    print(usestr + '\n' + msg, file=sys.stderr)
+    sys.exit(1)
+
+
+def get_command(name):
+    """import (on first use) and return the function running subcommand name"""
+    try:
+        module_name, function_name = SUBCOMMANDS[name]
+    except KeyError:
+        raise JobSpecError('unknown subcommand "{}", choose from {}'.format(name, sorted(SUBCOMMANDS)))
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def run(name, argv):
+    """run subcommand name with argv, returns the exit code"""
+    sys.argv[0] = 'rnaseq-helpers {}'.format(name)  # for the subcommands' own usage messages
+    try:
+        get_command(name)(argv)
+    except SystemExit as e:  # usage() and argparse exit, which must not end a batch
+        if e.code is None:
+            return 0
+        elif isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def parse_job(line):
+    """JSON job spec line to (command, args, stdout, id)"""
+    import json
+    try:
+        job = json.loads(line)
+    except ValueError as e:
+        raise JobSpecError('could not parse job spec as JSON: {}'.format(e))
+    if not isinstance(job, dict) or 'command' not in job:
+        raise JobSpecError('job spec must be an object with at least "command", not {}'.format(line.strip()))
+    args = job.get('args', [])
+    if not isinstance(args, list) or not all(isinstance(x, str) for x in args):
+        raise JobSpecError('"args" must be a list of strings, not {}'.format(args))
+    return job['command'], args, job.get('stdout'), job.get('id')
+
+
+def run_job(command, args, stdout=None, stdin_taken=False):
+    """run one batch job, with its standard output captured to stdout if set, returns the exit code
+
+    with stdin_taken, any attempt of the job to read stdin raises a JobSpecError
+    """
+    import contextlib
+    from rnaseq_helpers import helper_io
+    with contextlib.ExitStack() as stack:
+        if stdin_taken:
+            stdin, sys.stdin = sys.stdin, _StdinTaken()
+            stack.callback(setattr, sys, 'stdin', stdin)
+        if stdout is not None:
+            handle = stack.enter_context(helper_io.open_out(stdout))
+            stack.enter_context(contextlib.redirect_stdout(handle))
+        return run(command, args)
+
+
+def batch(jobs_in):
+    """run every job spec from jobs_in, reports status per job to stderr, returns the number of failed jobs"""
+    import json
+    import traceback
+    from rnaseq_helpers import helper_io
+    failed = 0
+    with helper_io.open_in(jobs_in) as handle:
+        for i, line in enumerate(handle):
+            if not line.strip():
+                continue
+            start = time.perf_counter()
+            report = {'line': i + 1}
+            try:
+                command, args, stdout, job_id = parse_job(line)
+                report.update(id=job_id, command=command)
+                exit_code = run_job(command, args, stdout, stdin_taken=jobs_in == helper_io.STDIO)
+                report['exit_code'] = exit_code
+            except Exception as e:  # one broken job must not take down the others
+                traceback.print_exc(file=sys.stderr)
+                report['exit_code'] = 1
+                report['error'] = '{}: {}'.format(type(e).__name__, e)
+            report['seconds'] = round(time.perf_counter() - start, 4)
+            if report['exit_code']:
+                failed += 1
+            print(json.dumps(report), file=sys.stderr)
+            sys.stderr.flush()
+    return failed
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] in ('-h', '--help'):
+        usage()
+    name, argv = argv[0], argv[1:]
+    if name == 'batch':
+        if len(argv) > 1 or (argv and argv[0] in ('-h', '--help')):
+            usage()
+        failed = batch(argv[0] if argv else '-')
+        sys.exit(1 if failed else 0)
+    if name not in SUBCOMMANDS:
+        usage('unknown subcommand "{}"'.format(name))
+    sys.argv[0] = 'rnaseq-helpers {}'.format(name)  # for the subcommands' own usage messages
+    get_command(name)(argv)
+
+
+if __name__ == "__main__":
+    main()
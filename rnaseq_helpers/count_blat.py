@@ -7,17 +7,23 @@ from __future__ import print_function
 import getopt
 import sys
 
+from rnaseq_helpers import helper_io
+from rnaseq_helpers import helper_profile
+
 
 def usage(msg=''):
-    usestr = """count_blat.py -i blat_file.psl [options] > blat_counts.tsv
+    usestr = """rnaseq-helpers count_blat -i blat_file.psl [options] > blat_counts.tsv
 counts the hits from a blast/blat file that match each target
 ###########################################################
 requires:
 -i|--in=        a blast (m8/outfmt6) or blat (out=blast8) formatted file
+                ('-' for stdin, may be gzip/bzip2/xz/zstd compressed)
 
 optional:
 -s|--sorted     if the file is already sorted by query and score this reduces required computation/memory
 -a|--all        set this parameter if you wish to count -all- and not just -best- blat hits
+--read_thread   read and decompress input in a background thread
+--profile=      write cProfile/tracemalloc output to files starting with this prefix
 -h|--help       prints this
 """
     print(usestr + '\n' + msg)
@@ -46,18 +52,20 @@ class BlastCounter:
                 by_query = [[query, target, score]]
             prev_query = query
 
-    def count(self, filein, re_sort=True, best_only=True):
+    def count(self, filein, re_sort=True, best_only=True, background=False):
         """count how many hits there are to each target sequence in blat output"""
+        with helper_io.open_in(filein, background=background) as handle:
+            # sorting by query name (first thing in each line)
+            if re_sort:
+                return self.count_lines(sorted(handle), re_sort=re_sort, best_only=best_only)
+            # if pre-sorted, stream
+            return self.count_lines(handle, re_sort=re_sort, best_only=best_only)
+
+    def count_lines(self, lines, re_sort=True, best_only=True):
+        """count how many hits there are to each target sequence in an iterable of blat output lines"""
         seen = {}
         by_targets = {}
 
-        # sorting by query name (first thing in each line)
-        if re_sort:
-            lines = open(filein).readlines()
-            lines = sorted(lines)
-        # if pre-sorted
-        else:
-            lines = open(filein)
         for query_set in self.by_query(lines):
             # confirm sort by query ID
             if query_set[0][0] in seen:
@@ -75,9 +83,6 @@ class BlastCounter:
             for hit in query_set:
                 self.init_or_incr(by_targets, hit[1])
 
-        if isinstance(lines, file):
-            lines.close()
-
         return by_targets
 
     @staticmethod
@@ -92,17 +97,21 @@ class SortingError(Exception):
     pass
 
 
-def main():
+def main(argv=None):
     """interpret user input, count and report hits to each target sequence"""
     # default parameters
     best = True
     re_sort = True
     filein = None
+    background = False
+    profile = None
 
     # this whole section interprets the command line parameters
+    if argv is None:
+        argv = sys.argv[1:]
     try:
-        opts, args = getopt.gnu_getopt(sys.argv[1:], "i:sah",
-                                       ["in=", "sorted", "all", "help"])
+        opts, args = getopt.gnu_getopt(argv, "i:sah",
+                                       ["in=", "sorted", "all", "read_thread", "profile=", "help"])
     except getopt.GetoptError as err:
         print (str(err))
         usage()
@@ -114,6 +123,10 @@ def main():
             re_sort = False
         elif o in ("-a", "--all"):
             best = False
+        elif o == "--read_thread":
+            background = True
+        elif o == "--profile":
+            profile = a
         elif o in ("-h", "--help"):
             usage()
         else:
@@ -125,7 +138,8 @@ def main():
     # process the blat file
     # all the mechanics are found in the class BlatCounter
     blast_counter = BlastCounter()
-    counts_by_target = blast_counter.count(filein, re_sort=re_sort, best_only=best)
+    with helper_profile.profiled(profile):
+        counts_by_target = blast_counter.count(filein, re_sort=re_sort, best_only=best, background=background)
     if not counts_by_target:
         print('WARN: no hits found, is the input file empty?', file=sys.stderr)
     # counts_by_target is now a dictionary with target IDs as keys and number of hits as values
@@ -5,10 +5,12 @@
 
 from __future__ import print_function
 
-from dustdas import gffhelper
 import argparse
 import sys
 
+from rnaseq_helpers import helper_io
+from rnaseq_helpers import helper_profile
+
 
 class Transcript(object):
     supported_targets = ('ass', 'dss', 'exon', 'intron', 'tss', 'tts', 'ep', 'exonpart', 'ip', 'intronpart')
@@ -163,9 +165,19 @@ class Transcript(object):
         return out
 
 
-def group_transcripts(gff):
+def read_gff(gff, background=False):
+    """generate gffhelper entries from a (possibly compressed, or '-' for stdin) gff3 file"""
+    from dustdas import gffhelper  # imported here, so the rest of the module loads without dustdas
+    with helper_io.open_in(gff, background=background) as handle:
+        for line in handle:
+            if line.startswith('#') or not line.strip():
+                continue
+            yield gffhelper.GFFObject(line)
+
+
+def group_transcripts(gff, background=False):
     """generate group of gff lines corresponding to one transcript (so with [transcript, exon, exon, exon, ...])"""
-    gh = gffhelper.read_gff_file(infile=gff)
+    gh = read_gff(gff, background=background)
     a_transcripts_worth = [next(gh)]
     for entry in gh:
         if entry.type == "transcript":
@@ -196,11 +208,13 @@ def validate_hint_types(user_hints):
     return hints
 
 
-def main():
+def main(argv=None):
     # parse all the arguments
     parser = argparse.ArgumentParser()
-    parser.add_argument('-i', '--gff3_in', required=True, help='input gff3 file with "transcript" and "exon" features')
-    parser.add_argument('-o', '--hints_out', required=True, help='output file')
+    parser.add_argument('-i', '--gff3_in', required=True, help='input gff3 file with "transcript" and "exon" features'
+                                                               ' (- for stdin, may be compressed)')
+    parser.add_argument('-o', '--hints_out', required=True, help='output file (- for stdout, compressed if ending '
+                                                                 'in .gz, .bz2, .xz or .zst)')
     parser.add_argument('-p', '--priority', default=4, type=int,
                         help='priority with which Augustus should consider these hints, hints with higher priority will'
                              ' be preferred in case of conflicting hints by Augustus')
@@ -210,12 +224,15 @@ def main():
     parser.add_argument('-t', '--hint_types', default='ass,dss,ep,ip,tss,tts',
                         help='comma separated list of hint types that should be produced. '
                              'Supported values are {}'.format(Transcript.supported_targets))
-    args = parser.parse_args()
+    parser.add_argument('--read_thread', action='store_true', help='read and decompress input in a background thread')
+    parser.add_argument('--profile', default=None, help='write cProfile/tracemalloc output to files starting with '
+                                                        'this prefix')
+    args = parser.parse_args(argv)
 
     hints = validate_hint_types(args.hint_types)
 
-    with open(args.hints_out, 'w') as handleout:
-        for a_transcripts_worth in group_transcripts(args.gff3_in):
+    with helper_profile.profiled(args.profile), helper_io.open_out(args.hints_out) as handleout:
+        for a_transcripts_worth in group_transcripts(args.gff3_in, background=args.read_thread):
             transcript = Transcript(a_transcripts_worth, trim_exonparts=args.trim_exonparts,
                                     trim_intronparts=args.trim_intronparts)
             handleout.write(transcript.make_lines(hints, priority=args.priority, source=args.source))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""shared streaming input/output for the helper scripts, with transparent (de)compression and '-' for stdin/stdout"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+
+# the (de)compression and threading modules are only imported once needed, to keep start up fast
+
+STDIO = '-'
+BUFFER_SIZE = 1 << 20  # 1MiB
+GZIP_LEVEL = 6  # gzip's own default of 9 is barely smaller and a lot slower
+
+# compression recognized from the first bytes of input (bgzip is just multi-member gzip)
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+# compression for output chosen by file ending, note gzip output is plain gzip, not bgzip's BGZF
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
+}
+# endings of (bgzipped) input that derived, plain gzip, output files should not carry over
+DERIVED_EXTENSIONS = {
+    '.bgz': '.gz',
+}
+
+
+class CompressionError(Exception):
+    pass
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise CompressionError("zstd compressed files require the python package 'zstandard' to be installed")
+    return zstandard
+
+
+def detect_compression(handle):
+    """compression of a binary, peekable, handle from its magic number, or None if uncompressed"""
+    start = handle.peek(6)[:6]
+    for magic, compression in MAGIC_NUMBERS:
+        if start.startswith(magic):
+            return compression
+    return None
+
+
+def compression_from_name(path):
+    """compression implied by file ending, or None"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def strip_compression_extension(path):
+    """file name without any compression ending, and the ending to use for files derived from it"""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in EXTENSIONS:
+        return root, ext
+    elif ext.lower() in DERIVED_EXTENSIONS:
+        return root, DERIVED_EXTENSIONS[ext.lower()]
+    return path, ''
+
+
+class _AlsoClosing(io.RawIOBase):
+    """pass through to a (de)compressing handle, that closes the file beneath it too
+
+    GzipFile, BZ2File and LZMAFile leave a file object they were handed open, so without this,
+    whatever is left in its buffer would only be written whenever it is garbage collected
+    """
+    def __init__(self, handle, raw):
+        super(_AlsoClosing, self).__init__()
+        self.handle = handle
+        self.raw = raw
+
+    def readable(self):
+        return self.handle.readable()
+
+    def writable(self):
+        return self.handle.writable()
+
+    def readinto(self, b):
+        return self.handle.readinto(b)
+
+    def write(self, b):
+        return self.handle.write(b)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.handle.close()
+            finally:
+                self.raw.close()
+        super(_AlsoClosing, self).close()
+
+
+def _decompressing(raw, compression):
+    if compression == 'gzip':
+        import gzip
+        return _AlsoClosing(gzip.GzipFile(fileobj=raw, mode='rb'), raw)
+    elif compression == 'bz2':
+        import bz2
+        return _AlsoClosing(bz2.BZ2File(raw, mode='rb'), raw)
+    elif compression == 'xz':
+        import lzma
+        return _AlsoClosing(lzma.LZMAFile(raw, mode='rb'), raw)
+    elif compression == 'zstd':
+        return _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+    return raw
+
+
+def _compressing(raw, compression):
+    if compression == 'gzip':
+        import gzip
+        return _AlsoClosing(gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL), raw)
+    elif compression == 'bz2':
+        import bz2
+        return _AlsoClosing(bz2.BZ2File(raw, mode='wb'), raw)
+    elif compression == 'xz':
+        import lzma
+        return _AlsoClosing(lzma.LZMAFile(raw, mode='wb'), raw)
+    elif compression == 'zstd':
+        return _zstandard().ZstdCompressor().stream_writer(raw, closefd=True)
+    return raw
+
+
+class BackgroundReader(io.RawIOBase):
+    """reads (and thereby decompresses) chunks from handle in a background thread
+
+    The zlib/bz2/lzma/zstd decompressors release the GIL, so decompression overlaps with parsing
+    in the main thread. At most queue_size chunks are read ahead.
+    """
+    def __init__(self, handle, chunk_size=BUFFER_SIZE, queue_size=8):
+        import queue
+        import threading
+        super(BackgroundReader, self).__init__()
+        self._Full = queue.Full
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(queue_size)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b'')
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name='BackgroundReader', daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while not self._stop.is_set():
+            try:
+                item = self.handle.read(self.chunk_size)
+            except Exception as e:  # handed over to, and raised in, the reading thread
+                item = e
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    break
+                except self._Full:
+                    pass
+            if not item or isinstance(item, Exception):
+                return
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self.handle.close()
+        super(BackgroundReader, self).close()
+
+
+class _KeepOpen(io.BufferedIOBase):
+    """binary pass through to another buffered stream, that only flushes, and does not close it, on close"""
+    def __init__(self, stream):
+        super(_KeepOpen, self).__init__()
+        self._stream = stream
+
+    def readable(self):
+        return self._stream.readable()
+
+    def writable(self):
+        return self._stream.writable()
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+    def read1(self, size=-1):
+        return self._stream.read1(size)
+
+    def readinto(self, b):
+        return self._stream.readinto(b)
+
+    def peek(self, size=0):
+        return self._stream.peek(size)
+
+    def write(self, b):
+        return self._stream.write(b)
+
+    def flush(self):
+        if self._stream.writable():
+            self._stream.flush()
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super(_KeepOpen, self).close()
+
+
+def _stdio_binary(stream):
+    """binary handle on (the possibly redirected) sys.stdin/sys.stdout, that leaves it open on close"""
+    if stream.writable():
+        stream.flush()
+    return _KeepOpen(stream.buffer)
+
+
+def open_in(path, text=True, background=False):
+    """open path (or stdin for '-') for buffered streaming reads, decompressing as necessary
+
+    Compression is detected from the content, not the file name. With background set, reading and
+    decompression happen in a separate thread.
+    """
+    if path == STDIO:
+        raw = _stdio_binary(sys.stdin)
+    else:
+        raw = open(path, 'rb', buffering=BUFFER_SIZE)
+    handle = _decompressing(raw, detect_compression(raw))
+    if background:
+        handle = BackgroundReader(handle)
+    if background or handle is not raw:
+        handle = io.BufferedReader(handle, buffer_size=BUFFER_SIZE)
+    if text:
+        handle = io.TextIOWrapper(handle, encoding='utf-8')
+    return handle
+
+
+def open_out(path, text=True, compression=None):
+    """open path (or stdout for '-') for buffered streaming writes, compressing as necessary
+
+    Unless given, compression is set by the file ending (.gz, .bz2, .xz or .zst), stdout is
+    only compressed on request. Gzip output is plain gzip, to index it (tabix, samtools faidx),
+    recompress it with bgzip.
+    """
+    if path == STDIO:
+        raw = _stdio_binary(sys.stdout)
+    else:
+        raw = open(path, 'wb', buffering=BUFFER_SIZE)
+        if compression is None:
+            compression = compression_from_name(path)
+    handle = _compressing(raw, compression)
+    if handle is not raw:
+        handle = io.BufferedWriter(handle, buffer_size=BUFFER_SIZE)
+    if text:
+        handle = io.TextIOWrapper(handle, encoding='utf-8', write_through=False)
+    return handle
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""optional cProfile and tracemalloc profiling behind the helper scripts' --profile option"""
+
+from __future__ import print_function
+
+import contextlib
+import sys
+
+
+@contextlib.contextmanager
+def profiled(prefix, top=30):
+    """profile the enclosed block if prefix is set, writing
+
+    prefix.prof              binary cProfile stats (for snakeviz, pstats, etc...)
+    prefix.prof.txt          the top functions by cumulative time
+    prefix.tracemalloc.txt   peak traced memory and the top allocating lines
+
+    note that tracing allocations slows python down considerably, so wall times are not comparable
+    to unprofiled runs
+    """
+    if prefix is None:
+        yield
+        return
+    import cProfile
+    import pstats
+    import tracemalloc
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        profiler.dump_stats(prefix + '.prof')
+        with open(prefix + '.prof.txt', 'w') as f:
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(top)
+        with open(prefix + '.tracemalloc.txt', 'w') as f:
+            f.write('peak traced memory: {:.1f} MiB\ncurrent traced memory: {:.1f} MiB\n\n'.format(
+                peak / 2 ** 20, current / 2 ** 20))
+            for stat in snapshot.statistics('lineno')[:top]:
+                f.write('{}\n'.format(stat))
+        print('profile written to {0}.prof, {0}.prof.txt and {0}.tracemalloc.txt'.format(prefix), file=sys.stderr)
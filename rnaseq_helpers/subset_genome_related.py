@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""make fasta/bam/gff files for sub-sequence of seq, with the range start_from-continue_to"""
+
+from __future__ import print_function
+### depends on samtools (tested 1.9)
+
+import argparse
+import functools
+import hashlib
+import heapq
+import os
+import re
+import subprocess
+import sys
+
+from rnaseq_helpers import helper_io
+from rnaseq_helpers import helper_profile
+
+
+# Named exceptions
+class OutOfRangeError(Exception):
+    pass
+
+
+class DependencyIssuesError(Exception):
+    pass
+
+
+class BamWithoutFastaError(Exception):
+    pass
+
+
+# help parsing args
+def parse_commas(x):
+    """comma sep to python list for parsing user ARGS"""
+    if x is None:
+        out = []
+    else:
+        out = x.split(',')
+    return out
+
+
+# naming of output files
+def get_name_out_fa(fasta, seq, start, end):
+    """set output fasta name based on input name"""
+    basename = re.sub(r'(\.fa$)|(\.fasta$)', '', fasta)
+    return '{}__{}_{}-{}.fa'.format(basename, seq, start, end)
+
+
+def get_name_out_bam(sam, seq, start, end):
+    """set output bam name based on input name"""
+    basename = re.sub(r'\.bam$', '', sam)
+    return '{}__{}_{}-{}.bam'.format(basename, seq, start, end)
+
+
+def get_name_out_gff(gff, seq, start, end):
+    """set output gff name based on input name (compressed the same way as the input), stdout for stdin"""
+    if gff == helper_io.STDIO:
+        return helper_io.STDIO
+    gff, compression_ending = helper_io.strip_compression_extension(gff)
+    endings = re.match(r'(.*)(\.g[tf]f3?)$', gff)
+    if endings is None:
+        raise ValueError('gff file name {} does not end in .gff, .gff3 or .gtf (optionally compressed)'.format(gff))
+    return '{}__{}_{}-{}{}{}'.format(endings.group(1), seq, start, end, endings.group(2), compression_ending)
+
+
+def version_tuple(version):
+    """version string to tuple of ints for comparison, e.g. '1.10' -> (1, 10)"""
+    return tuple(int(x) for x in version.split('.') if x)
+
+
+# samtools versions are fun, but I don't ultimately know which all will work, so warnings
+@functools.lru_cache(maxsize=None)  # once per process is enough, e.g. for batch mode
+def check_samtools(try_anyways):
+    """raises error if samtools absent or too old, unless user has set try_anyways"""
+    # all the version checking necessary because samtools remains unstable in terms of parameters
+    min_tested = "1.9" 
+    max_tested = "1.9"
+    if try_anyways:
+        return 0
+    samtools = 'samtools'
+    version = None
+    try:
+        version_str = subprocess.check_output([samtools, '--version'], universal_newlines=True)
+    except OSError:
+        raise DependencyIssuesError("Command {0} not recognized, {0} ({1}-{2}) must be installed/in $PATH".format(
+            samtools, min_tested, max_tested
+        ))
+
+    for line in version_str.split('\n'):
+        match = re.match('.*samtools *([0-9][.0-9]*).*', line)
+        if match:
+            version = match.group(1)
+            break
+    if version is None:
+        raise DependencyIssuesError("""
+{0} present but version could not be parsed from string
+{1}
+This script has been tested only for {0} {2}-{3}, if you wish to continue, please add --try_anyways""".format(
+            samtools, version_str, min_tested, max_tested
+        ))
+    if version_tuple(version) < version_tuple(min_tested):
+        
+        raise DependencyIssuesError("""
+{0} present but the identified version ({1}) is less than {2} where this script was tested
+if you wish to continue, please add --try_anyways""".format(samtools, version, min_tested))
+    elif version_tuple(version) > version_tuple(max_tested):
+        print("WARN: {} newer ({}) than {} where this script was tested, should hopefully work, but be warned".format(
+            samtools, version, max_tested
+        ), file=sys.stderr)
+    return 0
+
+
+# actually parsing subsections
+def get_range_fasta(fasta, seq, start, end):
+    """creates and indexes fasta file of just the requested sub sequence (by calling samtools)"""
+    fasta_out = get_name_out_fa(fasta, seq, start, end)
+    print('cropping {} and writing to {}'.format(fasta, fasta_out), file=sys.stderr)
+    if not os.path.exists(fasta + '.fai'):
+        subprocess.call(['samtools', 'faidx', fasta])
+    # save subsequence to fasta_out
+    subprocess.call(['samtools', 'faidx', fasta, '{}:{}-{}'.format(seq, start, end), '-o', fasta_out])
+    subprocess.call(['samtools', 'faidx', fasta_out])  # and reindex
+    return fasta_out
+
+
+def get_range_gff(gff, seq, start, end, background=False):
+    """creates gff file of just the requested subsequence and shifts coordinates"""
+    gff_out = get_name_out_gff(gff, seq, start, end)
+    print('cropping {} and writing to {}'.format(gff, gff_out), file=sys.stderr)
+    with helper_io.open_out(gff_out) as fout:
+        with helper_io.open_in(gff, background=background) as fin:
+            for line in fin:
+                try:
+                    fout.write(shift_gff_line(line, seq, start, end) + '\n')
+                except OutOfRangeError:  # this is also the filter
+                    pass
+
+
+def get_range_bam(bam, seq, start, end, fai, hard_clip=False, subsampler=None):
+    """creates and indexes bam file of just the requested sub sequence and shifts coordinates
+
+    if a SamSubsampler is given, only the reads (pairs) it selects are written
+    """
+    bam_out = get_name_out_bam(bam, seq, start, end)
+    print('cropping {} and writing to {}'.format(bam, bam_out), file=sys.stderr)
+    window = SamWindow(seq, start, end, hard_clip=hard_clip)
+    # stream samtools view -> clipping -> samtools view -b, so nothing is held in memory or written to a tmp sam
+    reader = subprocess.Popen(['samtools', 'view', bam, '{}:{}-{}'.format(seq, start, end)],
+                              stdout=subprocess.PIPE, universal_newlines=True)
+    writer = subprocess.Popen(['samtools', 'view', '-b', '-t', fai, '-o', bam_out, '-'],
+                              stdin=subprocess.PIPE, universal_newlines=True)
+    streamed = False
+    try:
+        shifted = window.shift_lines(reader.stdout)
+        if subsampler is not None:
+            shifted = subsampler.filter_lines(shifted)
+        for line in shifted:
+            writer.stdin.write(line + '\n')
+        streamed = True
+    finally:
+        for pipe in (reader.stdout, writer.stdin):
+            try:
+                pipe.close()
+            except BrokenPipeError:  # writer died, its exit status is reported below
+                pass
+        if not streamed:  # don't leave samtools running or a truncated bam behind
+            for process in (reader, writer):
+                process.kill()
+                process.wait()
+            _remove_if_exists(bam_out)
+    for process in (reader, writer):
+        if process.wait() != 0:
+            _remove_if_exists(bam_out)
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+    subprocess.check_call(['samtools', 'index', bam_out])
+
+
+def _remove_if_exists(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def shifted_coordinates(start, stop, ori_start, ori_stop):
+    """calculate local coordinates on sub-sequence start-stop for input global 'ori' coordinates"""
+    # all param coordinates count from 1 and stop is included, bc bioinfo formats x_x
+    shift_by = start - 1
+    length = stop - shift_by
+    out_start = ori_start - shift_by
+    out_stop = ori_stop - shift_by
+    if out_stop <= 0 or out_start > length:
+        raise OutOfRangeError('{} {} out of new 1 - {} range'.format(out_start, out_stop, length))
+    # the following only if some of range has overlap
+    # trim ends
+    out_start = max(1, out_start)
+    out_stop = min(out_stop, length)
+    return out_start, out_stop
+
+
+def shift_gff_line(line, seq, start, stop):
+    """adjust/shift one gff line from global coordinates to coordinates local to sub sequence"""
+    line = line.rstrip()
+    if line.startswith('#'):
+        return line
+    else:
+        sline = line.split('\t')
+    # update ref name
+    if sline[0] != seq:
+        raise OutOfRangeError('wrong chr {} not target {}'.format(sline[0], seq))
+    sline[0] = '{}:{}-{}'.format(sline[0], start, stop)
+    # update coordinates
+    mod_start, mod_stop = shifted_coordinates(start, stop, ori_start=int(sline[3]), ori_stop=int(sline[4]))
+    sline[3] = str(mod_start)
+    sline[4] = str(mod_stop)
+
+    return '\t'.join(sline)
+
+
+# sam records, cigar strings and mates
+CIGAR_RE = re.compile('([0-9]+)([MIDNSHP=X])')
+CONSUMES_REF = 'MDN=X'
+CONSUMES_QUERY = 'MIS=X'
+ALIGNED = 'M=X'
+
+FLAG_PAIRED = 0x1
+FLAG_UNMAPPED = 0x4
+# everything describing the mate, cleared when the mate does not make it into the window
+FLAGS_MATE = 0x1 | 0x2 | 0x8 | 0x20 | 0x40 | 0x80
+FLAGS_SEGMENT = 0x40 | 0x80
+FLAGS_NOT_PRIMARY = 0x100 | 0x800  # secondary or supplementary
+
+
+def parse_cigar(cigar):
+    """cigar string to list of (length, operation) tuples"""
+    return [(int(n), op) for n, op in CIGAR_RE.findall(cigar)]
+
+
+def format_cigar(cigar_ops):
+    """list of (length, operation) tuples back to cigar string"""
+    return ''.join('{}{}'.format(n, op) for n, op in cigar_ops)
+
+
+def reference_span(cigar_ops):
+    """number of reference bp covered by an alignment"""
+    return sum(n for n, op in cigar_ops if op in CONSUMES_REF)
+
+
+def _split_clips(cigar_ops):
+    """separate leading hard/soft clip lengths, the aligned core, and trailing soft/hard clip lengths"""
+    ops = list(cigar_ops)
+    clips = []
+    for idx in (0, -1):
+        hard = soft = 0
+        if ops and ops[idx][1] == 'H':
+            hard = ops.pop(idx)[0]
+        if ops and ops[idx][1] == 'S':
+            soft = ops.pop(idx)[0]
+        clips.append((hard, soft))
+    return clips[0], ops, clips[1]
+
+
+def _clip_leading(core, ref_bases):
+    """remove ref_bases reference positions from the start of core cigar ops
+
+    insertions, deletions, skips and padding left dangling at the new start are removed as well.
+    Returns the remaining ops, the reference positions removed and the query bases removed
+    """
+    ops = list(core)
+    ref_removed = 0
+    query_removed = 0
+    while ops:
+        n, op = ops[0]
+        if op in ALIGNED:
+            if ref_bases <= 0:
+                break
+            take = min(n, ref_bases)
+        else:
+            take = n
+        if op in CONSUMES_REF:
+            ref_bases -= take
+            ref_removed += take
+        if op in CONSUMES_QUERY:
+            query_removed += take
+        if take < n:
+            ops[0] = (n - take, op)
+        else:
+            ops.pop(0)
+    return ops, ref_removed, query_removed
+
+
+def _merge_clips(hard, soft, removed, hard_clip):
+    """clip ops (outermost first) for one end, and how many bases to trim from SEQ/QUAL there"""
+    if removed and hard_clip:
+        return [(hard + soft + removed, 'H')], soft + removed
+    out = []
+    if hard:
+        out.append((hard, 'H'))
+    if soft + removed:
+        out.append((soft + removed, 'S'))
+    return out, 0
+
+
+def clip_cigar(cigar_ops, clip_left, clip_right, hard_clip=False):
+    """clip reference positions off both ends of an alignment
+
+    Returns the new cigar ops, by how many reference positions the alignment start moved, and how many
+    bases must be trimmed from the start and end of SEQ/QUAL (only ever non-zero with hard_clip)
+    """
+    (lead_hard, lead_soft), core, (trail_hard, trail_soft) = _split_clips(cigar_ops)
+    core, moved_by, query_left = _clip_leading(core, clip_left)
+    core, _, query_right = _clip_leading(core[::-1], clip_right)
+    core = core[::-1]
+    if not any(op in ALIGNED for _, op in core):
+        raise OutOfRangeError('no aligned bases left after clipping {}'.format(format_cigar(cigar_ops)))
+    lead, trim_left = _merge_clips(lead_hard, lead_soft, query_left, hard_clip)
+    trail, trim_right = _merge_clips(trail_hard, trail_soft, query_right, hard_clip)
+    return lead + core + trail[::-1], moved_by, trim_left, trim_right
+
+
+def _trim(seq, trim_left, trim_right):
+    if seq == '*':
+        return seq
+    return seq[trim_left:len(seq) - trim_right]
+
+
+def _drop_tags(sline, names):
+    sline[11:] = [tag for tag in sline[11:] if tag[:2] not in names]
+
+
+def _get_tag(sline, name):
+    for tag in sline[11:]:
+        if tag[:2] == name:
+            return tag[5:]
+    return None
+
+
+def _set_tag(sline, name, value_type, value):
+    _drop_tags(sline, (name,))
+    sline.append('{}:{}:{}'.format(name, value_type, value))
+
+
+def clip_sam_record(sline, start, stop, hard_clip=False):
+    """clip one split sam record to the range start-stop (in place) and shift it to local coordinates
+
+    Only the read itself is handled (RNAME, POS, CIGAR, SEQ, QUAL), mates are left to SamWindow.
+    """
+    try:
+        ori_start = int(sline[3])
+        flag = int(sline[1])
+    except ValueError:
+        raise OutOfRangeError('unparseable position or flag {}'.format(sline[:4]))
+    sline[2] = '{}:{}-{}'.format(sline[2], start, stop)
+    shift_by = start - 1
+    if flag & FLAG_UNMAPPED or sline[5] == '*':
+        # unmapped reads placed by their mate, keep only if placed within range
+        if not start <= ori_start <= stop:
+            raise OutOfRangeError('unmapped read placed outside range at {}'.format(ori_start))
+        sline[3] = str(ori_start - shift_by)
+        return sline
+
+    cigar_ops = parse_cigar(sline[5])
+    ori_stop = ori_start + reference_span(cigar_ops) - 1
+    if ori_stop < start or ori_start > stop:
+        raise OutOfRangeError('{}-{} out of range {}-{}'.format(ori_start, ori_stop, start, stop))
+    clip_left = max(0, start - ori_start)
+    clip_right = max(0, ori_stop - stop)
+    if clip_left or clip_right:
+        cigar_ops, moved_by, trim_left, trim_right = clip_cigar(cigar_ops, clip_left, clip_right, hard_clip)
+        sline[5] = format_cigar(cigar_ops)
+        sline[9] = _trim(sline[9], trim_left, trim_right)
+        sline[10] = _trim(sline[10], trim_left, trim_right)
+        # mismatch info refers to the removed bases too, and is cheaper to drop than to recalculate
+        _drop_tags(sline, ('MD', 'NM'))
+    else:
+        moved_by = 0
+    sline[3] = str(ori_start + moved_by - shift_by)
+    return sline
+
+
+class SamWindow(object):
+    """streams coordinate sorted sam records overlapping a range, clipping them to it and fixing mates
+
+    Reads starting before the range are the only ones whose mate cannot be decided from PNEXT alone
+    (the mate may or may not reach into the range). As input is sorted, these all come first, so they
+    are held back until the first read starting within the range. Clipping can move their start past
+    that of later reads (when the range starts in a deletion or intron), so they are then released
+    in order of their new POS, as the stream reaches it, keeping the output sorted.
+    """
+    def __init__(self, seq, start, stop, hard_clip=False):
+        self.seq = seq
+        self.start = start
+        self.stop = stop
+        self.hard_clip = hard_clip
+        self.shift_by = start - 1
+        # (qname, segment flags) -> new POS of kept primary reads that started before the range
+        self.kept_left = {}
+
+    def shift_lines(self, lines):
+        """generate shifted sam lines (no trailing newline) from an iterable of sam lines"""
+        held_back = []  # heap of (new POS, input order, sline, original POS)
+        past_left_edge = False
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode()
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            elif line.startswith('@'):
+                yield line
+                continue
+            sline = line.split('\t')
+            try:
+                ori_start = int(sline[3])
+                clip_sam_record(sline, self.start, self.stop, self.hard_clip)
+            except OutOfRangeError:
+                continue
+            new_start = int(sline[3])
+            if not past_left_edge:
+                if ori_start < self.start:
+                    if not int(sline[1]) & FLAGS_NOT_PRIMARY:  # mates point at the primary alignment
+                        self.kept_left[self._key(sline)] = new_start
+                    heapq.heappush(held_back, (new_start, len(held_back), sline, ori_start))
+                    continue
+                past_left_edge = True
+            while held_back and held_back[0][0] <= new_start:
+                _, _, held_sline, held_start = heapq.heappop(held_back)
+                yield '\t'.join(self.fix_mate(held_sline, held_start))
+            yield '\t'.join(self.fix_mate(sline, ori_start))
+        while held_back:
+            _, _, held_sline, held_start = heapq.heappop(held_back)
+            yield '\t'.join(self.fix_mate(held_sline, held_start))
+
+    @staticmethod
+    def _key(sline, mate=False):
+        segment = int(sline[1]) & FLAGS_SEGMENT
+        if mate:
+            segment ^= FLAGS_SEGMENT
+        return sline[0], segment
+
+    def fix_mate(self, sline, ori_start):
+        """point mate fields at the mate's new position, or unpair the read if the mate is not in range"""
+        flag = int(sline[1])
+        if not flag & FLAG_PAIRED:
+            return sline
+        mate_start = None
+        pnext = int(sline[7])
+        if sline[6] in ('=', self.seq):
+            if pnext < self.start:
+                mate_start = self.kept_left.get(self._key(sline, mate=True))
+            elif pnext <= self.stop:
+                mate_start = pnext - self.shift_by
+        if mate_start is None:
+            sline[1] = str(flag & ~FLAGS_MATE)
+            sline[6] = '*'
+            sline[7] = '0'
+            sline[8] = '0'
+            _drop_tags(sline, ('MC', 'MQ'))
+            return sline
+
+        sline[6] = '='
+        sline[7] = str(mate_start)
+        # template length clipped to the range (from the original leftmost position)
+        tlen = int(sline[8])
+        if tlen:
+            left = ori_start if tlen > 0 else pnext
+            right = left + abs(tlen) - 1
+            new_tlen = min(right, self.stop) - max(left, self.start) + 1
+            sline[8] = str(new_tlen if tlen > 0 else -new_tlen)
+        mate_cigar = _get_tag(sline, 'MC')
+        if mate_cigar is not None and mate_cigar != '*':
+            mate_ops = parse_cigar(mate_cigar)
+            mate_stop = pnext + reference_span(mate_ops) - 1
+            try:
+                mate_ops = clip_cigar(mate_ops, max(0, self.start - pnext), max(0, mate_stop - self.stop),
+                                      self.hard_clip)[0]
+                _set_tag(sline, 'MC', 'Z', format_cigar(mate_ops))
+            except OutOfRangeError:
+                _drop_tags(sline, ('MC',))
+        return sline
+
+
+class SamSubsampler(object):
+    """streaming subsampling of sam lines, keeping pairs together
+
+    With fraction, a read is kept when the seeded hash of its name falls within fraction, as
+    all alignments of a name hash the same, pairs are kept or dropped together without any state.
+    With max_depth (on coordinate sorted input), a read (or the first read of a pair) is kept only while
+    fewer than max_depth kept reads, mates included, cover its start. The decision for the first primary
+    read of a pair is remembered until its primary mate comes along, and mates are always kept with their
+    partner. Secondary and supplementary alignments are decided on their own, and never change the
+    decision for the pair. So
+    coverage only exceeds max_depth where mates of pairs admitted further upstream start after the cap
+    was reached. The excess is at most the number of such pairs whose mates overlap there, and these mates
+    block any new pairs until coverage is back below max_depth.
+    """
+    hash_range = 2 ** 64
+
+    def __init__(self, fraction=None, max_depth=None, seed=0):
+        if fraction is None and max_depth is None:
+            raise ValueError('at least one of fraction or max_depth is required for subsampling')
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError('fraction must be in (0, 1], not {}'.format(fraction))
+        if max_depth is not None and max_depth < 1:
+            raise ValueError('max_depth must be at least 1, not {}'.format(max_depth))
+        self.fraction = fraction
+        self.max_depth = max_depth
+        self.key = str(seed).encode()
+        self.threshold = None if fraction is None else int(fraction * self.hash_range)
+        # (qname, segment flags of the mate) -> decision already made for the first of a pair
+        self.mate_decisions = {}
+        self.kept_ends = []  # heap of stop coordinates of kept reads covering the current position
+
+    def keep_name(self, qname):
+        """seeded and deterministic keep/drop decision by read name"""
+        digest = hashlib.blake2b(qname.encode(), digest_size=8, key=self.key).digest()
+        return int.from_bytes(digest, 'big') < self.threshold
+
+    def filter_lines(self, lines):
+        """generate the kept sam lines from an iterable of (newline stripped) sam lines"""
+        for line in lines:
+            if line.startswith('@'):
+                yield line
+            elif self.keep(line.split('\t', 6)):
+                yield line
+
+    def keep(self, sline):
+        """decide on one record, sline needs at least the first 6 sam fields"""
+        if self.threshold is not None and not self.keep_name(sline[0]):
+            return False
+        if self.max_depth is None:
+            return True
+        flag = int(sline[1])
+        if not flag & FLAG_PAIRED or flag & FLAGS_NOT_PRIMARY:
+            return self._below_depth(sline)
+        segment = flag & FLAGS_SEGMENT
+        decision = self.mate_decisions.pop((sline[0], segment), None)
+        if decision is not None:
+            if decision:
+                self._add_depth(sline)  # mates count towards depth, even though they can't be refused
+            return decision
+        decision = self._below_depth(sline)
+        self.mate_decisions[(sline[0], segment ^ FLAGS_SEGMENT)] = decision
+        return decision
+
+    def _depth_at(self, start):
+        """number of kept reads covering start, forgetting those ending before it"""
+        kept_ends = self.kept_ends
+        while kept_ends and kept_ends[0] < start:
+            heapq.heappop(kept_ends)
+        return len(kept_ends)
+
+    def _add_depth(self, sline):
+        start = int(sline[3])
+        self._depth_at(start)
+        if sline[5] == '*':
+            stop = start
+        else:
+            stop = start + max(reference_span(parse_cigar(sline[5])), 1) - 1
+        heapq.heappush(self.kept_ends, stop)
+
+    def _below_depth(self, sline):
+        if self._depth_at(int(sline[3])) >= self.max_depth:
+            return False
+        self._add_depth(sline)
+        return True
+
+
+# and finally, flow control
+def main(fasta, bams, gffs, seq, start_from, continue_to, try_anyways, hard_clip=False,
+         subsample_fraction=None, max_depth=None, seed=0, background=False):
+    """handles -> subsequence conversion of each provided file"""
+    check_samtools(try_anyways)
+    if fasta is None and bams is not None:
+        raise BamWithoutFastaError("Cannot reconstruct bam header without fasta, please specify --fasta <your fasta>")
+
+    if fasta is not None:
+        fasta_out = get_range_fasta(fasta, seq, start_from, continue_to)
+
+        for bam in parse_commas(bams):
+            subsampler = None
+            if subsample_fraction is not None or max_depth is not None:
+                subsampler = SamSubsampler(fraction=subsample_fraction, max_depth=max_depth, seed=seed)
+            get_range_bam(bam, seq, start_from, continue_to, fasta_out + '.fai', hard_clip=hard_clip,
+                          subsampler=subsampler)
+
+    for gff in parse_commas(gffs):
+        get_range_gff(gff, seq, start_from, continue_to, background=background)
+
+
+def cli(argv=None):
+    """parse command line arguments and run"""
+    parser = argparse.ArgumentParser(description='tool to organize subsetting of fasta, bam, gff. All samtools sorting '
+                                                 'and indexing of .bams must already be done. Ranges start at 1 and '
+                                                 'are inclusive so as to match samtools / gff coordinates etc...')
+    parser.add_argument('--fasta', nargs='?', default=None, help='fasta file to subset')
+    parser.add_argument('--bam', nargs='?', default=None, help='bam file to subset (comma separate for multiple),'
+                                                               'requires --fasta')
+    parser.add_argument('--gff', nargs='?', default=None, help='gff file to subset (comma separate for multiple), '
+                                                               'may be compressed, - to read stdin and write stdout')
+
+    parser.add_argument('-s', '--seq', required=True, help='target sequence')
+    parser.add_argument('-f', '--start', default=1, type=int, help='starting _from_ this bp (count from 1, because...)')
+    parser.add_argument('-t', '--end', default=1e16, type=int, help='continue _to_ this bp')
+    parser.add_argument('--try_anyways', action='store_true', help='ignores any errors/warnings on samtools versions')
+    parser.add_argument('--hard_clip', action='store_true', help='hard clip (remove) read bases falling outside '
+                                                                  'the range, instead of soft clipping them')
+    parser.add_argument('--subsample_fraction', default=None, type=float,
+                        help='keep only this fraction (0-1] of reads/pairs from each bam, chosen by read name hash')
+    parser.add_argument('--max_depth', default=None, type=int,
+                        help='keep reads/pairs from each bam only while coverage at their start is below this')
+    parser.add_argument('--seed', default=0, type=int, help='seed for --subsample_fraction')
+    parser.add_argument('--read_thread', action='store_true', help='read and decompress --gff in a background thread')
+    parser.add_argument('--profile', default=None, help='write cProfile/tracemalloc output to files starting with '
+                                                        'this prefix')
+    args = parser.parse_args(argv)
+    with helper_profile.profiled(args.profile):
+        main(args.fasta, args.bam, args.gff, args.seq, args.start, args.end, args.try_anyways, args.hard_clip,
+             subsample_fraction=args.subsample_fraction, max_depth=args.max_depth, seed=args.seed,
+             background=args.read_thread)
+
+
+if __name__ == "__main__":
+    cli()
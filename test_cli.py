@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""checks for the rnaseq-helpers dispatcher and its batch mode (run with pytest)"""
+
+import gzip
+import io
+import json
+import sys
+
+import pytest
+
+from rnaseq_helpers import cli
+
+
+@pytest.fixture(autouse=True)
+def keep_argv(monkeypatch):
+    # run() names each job in sys.argv[0]
+    monkeypatch.setattr(sys, 'argv', list(sys.argv))
+
+
+@pytest.fixture
+def text_in(tmp_path):
+    path = tmp_path / 'in.txt'
+    path.write_text('gene AT1G01010 and At5g12345\nnothing here\n')
+    return str(path)
+
+
+def run_batch(tmp_path, capsys, jobs):
+    jobs_in = tmp_path / 'jobs.jsonl'
+    jobs_in.write_text(''.join(line + '\n' for line in jobs))
+    failed = cli.batch(str(jobs_in))
+    reports = [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith('{')]
+    return failed, reports
+
+
+def job(command, args, **kwargs):
+    return json.dumps(dict(command=command, args=args, **kwargs))
+
+
+def test_parse_job():
+    assert cli.parse_job(job('count_blat', ['-i', 'x'], stdout='y', id=3)) == ('count_blat', ['-i', 'x'], 'y', 3)
+    with pytest.raises(cli.JobSpecError):
+        cli.parse_job('{"command": "count_blat"')
+    with pytest.raises(cli.JobSpecError):
+        cli.parse_job('{"args": []}')
+    with pytest.raises(cli.JobSpecError):
+        cli.parse_job(job('count_blat', ['-i', 1]))
+
+
+def test_batch_captures_stdout(tmp_path, capsys, text_in):
+    out = str(tmp_path / 'agis.txt.gz')
+    failed, reports = run_batch(tmp_path, capsys, [job('agi_finder', ['-i', text_in], stdout=out, id='x')])
+    assert failed == 0
+    assert reports[0]['id'] == 'x' and reports[0]['exit_code'] == 0
+    with gzip.open(out, 'rt') as f:
+        assert f.read() == 'AT1G01010\nAT5G12345\n'
+
+
+def test_batch_survives_broken_jobs(tmp_path, capsys, text_in):
+    out = str(tmp_path / 'agis.txt')
+    failed, reports = run_batch(tmp_path, capsys, [
+        job('no_such_command', []),
+        '{"command": "agi_finder", ',
+        job('agi_finder', ['-h']),  # getopt usage exits 1
+        job('subset_genome_related', []),  # argparse exits 2, missing -s
+        job('agi_finder', ['-i', text_in], stdout=out),
+    ])
+    assert failed == 4
+    assert [r['exit_code'] for r in reports] == [1, 1, 1, 2, 0]
+    assert reports[0]['error'].startswith('JobSpecError: unknown subcommand')
+    assert reports[1]['error'].startswith('JobSpecError: could not parse')
+    assert [r['line'] for r in reports] == [1, 2, 3, 4, 5]
+    with open(out) as f:
+        assert f.read() == 'AT1G01010\nAT5G12345\n'
+
+
+def test_batch_jobs_cannot_read_stdin_carrying_job_specs(monkeypatch, capsys, tmp_path):
+    out = str(tmp_path / 'agis.txt')
+    jobs = job('agi_finder', ['-i', '-'], stdout=out) + '\n'
+    stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(jobs.encode())))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    assert cli.batch('-') == 1
+    report = json.loads(capsys.readouterr().err.splitlines()[-1])
+    assert report['error'].startswith('JobSpecError: stdin is carrying the job specs')
+    assert sys.stdin is stdin
+
+
+def test_batch_jobs_read_stdin_with_job_specs_from_file(monkeypatch, capsys, tmp_path):
+    out = str(tmp_path / 'agis.txt')
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BufferedReader(io.BytesIO(b'AT1G01010\n'))))
+    failed, reports = run_batch(tmp_path, capsys, [job('agi_finder', ['-i', '-'], stdout=out)])
+    assert failed == 0
+    with open(out) as f:
+        assert f.read() == 'AT1G01010\n'
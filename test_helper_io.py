@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""checks for the (de)compressing input/output of helper_io.py (run with pytest)"""
+
+import gzip
+import io
+import sys
+
+import pytest
+
+from rnaseq_helpers import helper_io
+
+TEXT = ''.join('line {}\tsome\tfields\n'.format(i) for i in range(5000))
+ENDINGS = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zstd': '.zst', None: '.txt'}
+
+
+@pytest.mark.parametrize('background', [False, True])
+@pytest.mark.parametrize('compression', sorted(ENDINGS, key=str))
+def test_round_trip(tmp_path, compression, background):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    path = str(tmp_path / ('x' + ENDINGS[compression]))
+    with helper_io.open_out(path) as f:
+        f.write(TEXT)
+    with open(path, 'rb') as f:
+        assert helper_io.detect_compression(f) == compression
+    with helper_io.open_in(path, background=background) as f:
+        assert f.read() == TEXT
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_multi_member_gzip(tmp_path, background):
+    # as written by bgzip
+    path = str(tmp_path / 'x.bgz')
+    half = len(TEXT) // 2
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(TEXT[:half].encode()))
+        f.write(gzip.compress(TEXT[half:].encode()))
+    with helper_io.open_in(path, background=background) as f:
+        assert list(f) == TEXT.splitlines(True)
+
+
+def test_explicit_compression_overrides_ending(tmp_path):
+    path = str(tmp_path / 'x.txt')
+    with helper_io.open_out(path, compression='gzip') as f:
+        f.write(TEXT)
+    with open(path, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+
+
+def test_strip_compression_extension():
+    assert helper_io.strip_compression_extension('a.gff.gz') == ('a.gff', '.gz')
+    assert helper_io.strip_compression_extension('a.gff.bgz') == ('a.gff', '.gz')
+    assert helper_io.strip_compression_extension('a.gff') == ('a.gff', '')
+
+
+@pytest.mark.parametrize('background', [False, True])
+@pytest.mark.parametrize('ending', ['.txt', '.gz'])
+def test_empty_file(tmp_path, ending, background):
+    path = str(tmp_path / ('empty' + ending))
+    with helper_io.open_out(path):
+        pass
+    with helper_io.open_in(path, background=background) as f:
+        assert f.read() == ''
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_stdin(monkeypatch, background):
+    stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(TEXT.encode()))))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    with helper_io.open_in(helper_io.STDIO, background=background) as f:
+        assert f.read() == TEXT
+    assert not stdin.closed
+
+
+def test_stdout(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    stdout.write('before\n')
+    with helper_io.open_out(helper_io.STDIO) as f:
+        f.write(TEXT)
+    stdout.write('after\n')
+    stdout.flush()
+    assert not stdout.closed
+    assert stdout.buffer.getvalue().decode() == 'before\n' + TEXT + 'after\n'
+
+
+def test_stdout_compressed_on_request(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    with helper_io.open_out(helper_io.STDIO, compression='gzip') as f:
+        f.write(TEXT)
+    assert gzip.decompress(stdout.buffer.getvalue()).decode() == TEXT
+
+
+def test_background_reader_raises_in_reading_thread(tmp_path):
+    path = str(tmp_path / 'broken.gz')
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(TEXT.encode())[:-100])  # truncated
+    with helper_io.open_in(path, background=True) as f:
+        with pytest.raises(EOFError):
+            f.read()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""checks for the cigar clipping and mate fix up of subset_genome_related.py (run with pytest)"""
+
+import pytest
+
+from rnaseq_helpers.subset_genome_related import (OutOfRangeError, SamSubsampler, SamWindow, clip_cigar, format_cigar,
+                                                  parse_cigar, reference_span)
+
+
+def clip(cigar, clip_left, clip_right, hard_clip=False):
+    ops, moved_by, trim_left, trim_right = clip_cigar(parse_cigar(cigar), clip_left, clip_right, hard_clip)
+    return format_cigar(ops), moved_by, trim_left, trim_right
+
+
+def test_reference_span():
+    assert reference_span(parse_cigar('5S10M2I3D100N10M4H')) == 123
+
+
+def test_clip_soft_merges_existing_clips():
+    assert clip('5S20M', 6, 0) == ('11S14M', 6, 0, 0)
+    assert clip('20M3S2H', 0, 4) == ('16M7S2H', 0, 0, 0)
+
+
+def test_clip_hard_trims_sequence():
+    assert clip('2H5S20M', 6, 0, hard_clip=True) == ('13H14M', 6, 11, 0)
+
+
+def test_clip_drops_dangling_ops_at_edges():
+    # insertion right after the clip point goes into the clip
+    assert clip('5M2I10M', 5, 0) == ('7S10M', 5, 0, 0)
+    # deletion/intron right after the clip point is removed and moves the start on
+    assert clip('5M3D10M', 5, 0) == ('5S10M', 8, 0, 0)
+    assert clip('10M100N10M', 4, 0) == ('4S6M100N10M', 4, 0, 0)
+    # clip point inside an intron removes it completely
+    assert clip('10M100N10M', 50, 0) == ('10S10M', 110, 0, 0)
+    assert clip('10M100N10M', 0, 50) == ('10M10S', 0, 0, 0)
+
+
+def test_clip_everything_raises():
+    with pytest.raises(OutOfRangeError):
+        clip('10M', 10, 0)
+
+
+def sam(qname, flag, pos, cigar, rnext='=', pnext=0, tlen=0, tags=()):
+    seq = 'A' * sum(n for n, op in parse_cigar(cigar) if op in 'MIS=X')
+    return '\t'.join([qname, str(flag), 'chr1', str(pos), '60', cigar, rnext, str(pnext), str(tlen), seq, '*']
+                     + list(tags))
+
+
+def shift(lines, **kwargs):
+    return [line.split('\t') for line in SamWindow('chr1', 101, 200, **kwargs).shift_lines(lines)]
+
+
+def test_window_clips_and_fixes_pair_across_left_edge():
+    lines = [sam('r1', 99, 90, '20M', pnext=150, tlen=80, tags=['MC:Z:20M', 'MD:Z:20']),
+             sam('r1', 147, 150, '20M', pnext=90, tlen=-80, tags=['MC:Z:20M'])]
+    first, second = shift(lines)
+    assert first[3:9] == ['1', '60', '11S9M', '=', '50', '69']
+    assert first[11:] == ['MC:Z:20M']  # MD is stale after clipping
+    assert second[3:9] == ['50', '60', '20M', '=', '1', '-69']
+    assert second[11:] == ['MC:Z:11S9M']
+
+
+def test_window_unpairs_mates_outside():
+    lines = [sam('r1', 99, 180, '50M', pnext=400, tlen=270, tags=['MC:Z:50M']),
+             sam('r2', 97, 150, '10M', rnext='chr2', pnext=10)]
+    for record in shift(lines):
+        assert int(record[1]) & 0xeb == 0
+        assert record[6:9] == ['*', '0', '0']
+        assert not any(tag.startswith('MC') for tag in record[11:])
+
+
+def test_window_unpairs_mate_that_ends_before_window():
+    # r1's mate at 50 never reaches the window, so is not in the stream
+    lines = [sam('r1', 147, 95, '20M', pnext=50, tlen=-65)]
+    record, = shift(lines)
+    assert record[1] == str(147 & ~0xeb)
+    assert record[3] == '1'
+
+
+def test_window_hard_clip_trims_seq():
+    record, = shift([sam('r1', 0, 195, '10M')], hard_clip=True)
+    assert record[5] == '6M4H'
+    assert record[9] == 'A' * 6
+
+
+def test_window_keeps_output_sorted_for_spliced_read_across_left_edge():
+    lines = [sam('spliced', 0, 50, '10M100N10M'),
+             sam('r2', 0, 90, '20M'),
+             sam('r3', 0, 120, '10M'),
+             sam('r4', 0, 170, '10M')]
+    records = [(line.split('\t')[0], int(line.split('\t')[3]))
+               for line in SamWindow('chr1', 101, 1000).shift_lines(lines)]
+    assert records == [('r2', 1), ('r3', 20), ('spliced', 60), ('r4', 70)]
+
+
+def test_window_mate_ignores_secondary_alignments():
+    lines = [sam('r1', 99, 90, '20M', pnext=150, tlen=80),
+             sam('r1', 99 | 0x100, 85, '10M100N10M', pnext=150),  # secondary of the same segment, at 95 after clipping
+             sam('r1', 147, 150, '20M', pnext=90, tlen=-80)]
+    mate, = [record for record in shift(lines) if record[1] == '147']
+    assert mate[6:8] == ['=', '1']
+
+
+def test_subsampler_counts_mates_towards_depth():
+    lines = [sam('a', 99, 1, '100M', pnext=50),
+             sam('a', 147, 50, '100M', pnext=1),
+             sam('b', 0, 120, '10M')]  # only covered by a's mate
+    kept = [line.split('\t')[0] for line in SamSubsampler(max_depth=1).filter_lines(lines)]
+    assert kept == ['a', 'a']
+
+
+def test_subsampler_secondary_does_not_split_pair():
+    lines = [sam('a', 99, 1, '100M', pnext=60),
+             sam('b', 0, 10, '100M'),
+             sam('a', 99 | 0x100, 20, '50M', pnext=60),  # refused, depth is already 2
+             sam('a', 147, 60, '100M', pnext=1)]
+    kept = [(line.split('\t')[0], line.split('\t')[1]) for line in SamSubsampler(max_depth=2).filter_lines(lines)]
+    assert kept == [('a', '99'), ('b', '0'), ('a', '147')]
+
+
+def test_subsampler_fraction_is_stateless():
+    subsampler = SamSubsampler(fraction=0.5)
+    list(subsampler.filter_lines([sam('r{}'.format(i), 99, 1, '10M', pnext=1000) for i in range(100)]))
+    assert subsampler.mate_decisions == {}